@@ -0,0 +1,94 @@
+import asyncio
+import random
+from typing import Any, Dict, Type
+
+from autogen_core.models import UserMessage
+from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+from pydantic import BaseModel
+
+# Shared by the agent handlers to detect requests that need the full travel planner.
+# Callers lowercase the message once and reuse it for their other keyword checks;
+# a plain substring test on that copy is much faster than a case-insensitive regex.
+_TRAVEL_PLAN_NEEDLE = "travel plan"
+
+
+def is_travel_plan_request(content_lower: str) -> bool:
+    return _TRAVEL_PLAN_NEEDLE in content_lower
+
+
+# Simulated booking references look like "FL-1234-PAR": a kind prefix, four random
+# digits and the first three letters of the city
+def make_booking_reference(prefix: str, city: str) -> str:
+    return f"{prefix}-{random.randrange(1000, 10000)}-{city[:3].upper()}"
+
+
+def _strict_schema(node: Dict[str, Any]) -> Dict[str, Any]:
+    # Strict structured outputs need every property listed as required, no extra
+    # properties and no defaults, at every level of the schema
+    node = {key: value for key, value in node.items() if key != "default"}
+    if "properties" in node:
+        node["properties"] = {
+            name: _strict_schema(prop) for name, prop in node["properties"].items()
+        }
+        node["required"] = list(node["properties"])
+        node["additionalProperties"] = False
+    if "items" in node:
+        node["items"] = _strict_schema(node["items"])
+    for key in ("anyOf", "allOf"):
+        if key in node:
+            node[key] = [_strict_schema(option) for option in node[key]]
+    if "$defs" in node:
+        node["$defs"] = {
+            name: _strict_schema(definition) for name, definition in node["$defs"].items()
+        }
+    return node
+
+
+# Builds the strict JSON schema response_format for a pydantic model. Passing the model
+# class instead makes the client regenerate the schema and parse the reply on every call.
+def strict_response_format(model_type: Type[BaseModel]) -> Dict[str, Any]:
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model_type.__name__,
+            "schema": _strict_schema(model_type.model_json_schema()),
+            "strict": True,
+        },
+    }
+
+
+# Shared structured-output call with a precomputed response format
+class StructuredCaller:
+    """
+    Runs structured-output prompts against the model, one call per prompt.
+
+    The strict response format is built once from ``item_type``, and the number of
+    calls in flight across every agent instance sharing the caller is bounded.
+
+    Attributes:
+        max_concurrency (int): Maximum number of calls in flight at once.
+    """
+
+    def __init__(
+        self,
+        model_client: AzureOpenAIChatCompletionClient,
+        item_type: Type[BaseModel],
+        source: str,
+        max_concurrency: int,
+    ) -> None:
+        self._model_client = model_client
+        self._item_type = item_type
+        self._create_args: Dict[str, Any] = {
+            "response_format": strict_response_format(item_type)
+        }
+        self._source = source
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def create(self, prompt: str) -> BaseModel:
+        async with self._slots:
+            response = await self._model_client.create(
+                [UserMessage(content=prompt, source=self._source)],
+                extra_create_args=self._create_args,
+            )
+        return self._item_type.model_validate_json(response.content)
@@ -38,29 +38,29 @@ class LlamaIndexAgent(RoutedAgent):
         llama_index_agent: AgentRunner,
         memory: Optional[BaseMemory] = None,
     ) -> None:
-        logger.info("=" * 50)
-        logger.info("Initializing LlamaIndexAgent")
+        logger.debug("=" * 50)
+        logger.debug("Initializing LlamaIndexAgent")
         try:
             super().__init__("LlamaIndexAgent")
-            logger.info("Base RoutedAgent initialized")
+            logger.debug("Base RoutedAgent initialized")
             
             self._llama_index_agent = llama_index_agent
-            logger.info(f"LlamaIndex agent runner set: {type(llama_index_agent)}")
+            logger.debug("LlamaIndex agent runner set: %s", type(llama_index_agent))
             
             self._memory = memory
-            logger.info(f"Memory initialized: {type(memory) if memory else 'No memory'}")
+            logger.debug("Memory initialized: %s", type(memory) if memory else 'No memory')
             
             self._session_id = None
             
-            logger.info("LlamaIndexAgent initialization completed successfully")
+            logger.debug("LlamaIndexAgent initialization completed successfully")
             
         except Exception as e:
             logger.error("Error initializing LlamaIndexAgent")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error message: {str(e)}")
+            logger.error("Error type: %s", type(e))
+            logger.error("Error message: %s", e)
             logger.error("Error details:", exc_info=True)
             raise
-        logger.info("=" * 50)
+        logger.debug("=" * 50)
 
     @message_handler
     async def handle_user_message(
@@ -87,7 +87,7 @@ class LlamaIndexAgent(RoutedAgent):
                     response_text = "I apologize, but I'm having trouble processing your request. Could you please rephrase it or break it down into smaller parts?"
                     structured_response = AgentStructuredResponse(
                         agent_type="default_agent",
-                        data=GroupChatMessage(
+                        data=GroupChatMessage.model_construct(
                             source="default_agent",
                             content=response_text
                         ),
@@ -102,22 +102,26 @@ class LlamaIndexAgent(RoutedAgent):
                     raise
 
             if isinstance(response, AgentChatResponse):
+                # response.response is a str produced by llama-index, so the reply
+                # models below are built without revalidation
                 try:
                     if self._memory is not None:
-                        self._memory.put(
-                            ChatMessage(role=MessageRole.USER, content=message.content)
-                        )
-                        self._memory.put(
-                            ChatMessage(role=MessageRole.ASSISTANT, content=response.response)
+                        self._memory.put_messages(
+                            [
+                                ChatMessage(role=MessageRole.USER, content=message.content),
+                                ChatMessage(
+                                    role=MessageRole.ASSISTANT, content=response.response
+                                ),
+                            ]
                         )
 
                     structured_response = AgentStructuredResponse(
                         agent_type="default_agent",
-                        data=GroupChatMessage(
+                        data=GroupChatMessage.model_construct(
                             source="default_agent",
                             content=response.response
                         ),
-                        message=f"\n{response.response}\n",
+                        message=response.response,
                     )
 
                     target_topic = DefaultTopicId(type="user_proxy", source=self._session_id)
@@ -125,22 +129,22 @@ class LlamaIndexAgent(RoutedAgent):
                     
                 except Exception as process_error:
                     logger.error("Error processing agent response")
-                    logger.error(f"Error type: {type(process_error)}")
-                    logger.error(f"Error message: {str(process_error)}")
+                    logger.error("Error type: %s", type(process_error))
+                    logger.error("Error message: %s", process_error)
                     logger.error("Processing error details:", exc_info=True)
                     raise
 
         except Exception as e:
             logger.error("Error in handle_user_message")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error message: {str(e)}")
+            logger.error("Error type: %s", type(e))
+            logger.error("Error message: %s", e)
             logger.error("Error details:", exc_info=True)
             
             # 发送友好的错误消息给用户
             await self.publish_message(
                 AgentStructuredResponse(
                     agent_type="default_agent",
-                    data=GroupChatMessage(
+                    data=GroupChatMessage.model_construct(
                         source="default_agent",
                         content="I apologize, but I encountered an error while processing your request."
                     ),
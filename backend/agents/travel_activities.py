@@ -1,8 +1,10 @@
 import asyncio
 import json
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import ClassVar, List, Optional, Tuple
 
 import aiohttp
+import orjson
 from autogen_core import AgentId, MessageContext
 from autogen_core import (
     DefaultTopicId,
@@ -14,7 +16,8 @@ from autogen_core.models import LLMMessage, SystemMessage, UserMessage
 from autogen_core.tool_agent import tool_agent_caller_loop
 from autogen_core.tools import FunctionTool, Tool
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
-from bs4 import BeautifulSoup
+from pydantic import ValidationError
+from selectolax.lexbor import LexborHTMLParser
 from tenacity import retry, stop_after_attempt, wait_random_exponential
 from typing_extensions import Annotated
 
@@ -28,6 +31,7 @@ from ..data_types import (
     TravelRequest,
 )
 from ..otlp_tracing import logger
+from .common import StructuredCaller, is_travel_plan_request
 
 
 # Retry logic for Bing search with exponential backoff
@@ -45,49 +49,102 @@ async def _search_custom_bing(session, query_params: dict) -> dict:
         },
         headers=headers,
     ) as response:
-        return await response.json()
+        return orjson.loads(await response.read())
+
+
+# Only the start of a page is useful in the LLM prompt, so cap what is read and kept
+_MAX_PAGE_BYTES = 262_144
+_MAX_PAGE_TEXT_CHARS = 8_192
+_FETCH_TIMEOUT = aiohttp.ClientTimeout(total=8)
+
+# Pages larger than this are parsed in a worker thread to keep the event loop responsive.
+# A dedicated pool keeps parsing from starving the default executor, which aiohttp
+# also uses for DNS resolution.
+_LARGE_PAGE_CHARS = 200_000
+_PARSE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="html-parse")
+
+
+def _extract_text(html_content: str) -> str:
+    tree = LexborHTMLParser(html_content)
+    if tree.body is None:
+        return ""
+    return tree.body.text(separator=" ", strip=True)
 
 
 # Fetch the content of a given URL and return the text
 async def _fetch_content(session, url: str) -> str:
-    async with session.get(url) as response:
-        html_content = await response.text()
-        soup = BeautifulSoup(html_content, "html.parser")
-        return soup.get_text(separator=" ", strip=True)
+    async with session.get(url, timeout=_FETCH_TIMEOUT) as response:
+        if not response.headers.get("content-type", "").startswith("text/html"):
+            return ""
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(16384):
+            body += chunk
+            if len(body) >= _MAX_PAGE_BYTES:
+                break
+        html_content = body.decode(response.charset or "utf-8", errors="replace")
+    if len(html_content) > _LARGE_PAGE_CHARS:
+        text = await asyncio.get_running_loop().run_in_executor(
+            _PARSE_POOL, _extract_text, html_content
+        )
+    else:
+        text = _extract_text(html_content)
+    return text[:_MAX_PAGE_TEXT_CHARS]
+
+
+# Shared HTTP session so Bing searches and page fetches reuse pooled connections
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32, ttl_dns_cache=300, keepalive_timeout=60
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+    return _http_session
+
+
+async def close_http_session() -> None:
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
 
 
 # Perform Bing search and extract content from the search results
 async def get_info_from_bing_search(
     search_query: Annotated[str, "query to search on Bing for information"]
 ) -> str:
-    logger.info(f"Performing Bing search for: {search_query}")
-    async with aiohttp.ClientSession() as session:
-        search_params = {"q": search_query, "count": 6}
+    logger.info("Performing Bing search for: %s", search_query)
+    session = _get_http_session()
+    search_params = {"q": search_query, "count": 6}
 
-        search_results = await _search_custom_bing(
-            session=session, query_params=search_params
-        )
-        urls = [result["url"] for result in search_results["webPages"]["value"]]
-        snippets = [result["snippet"] for result in search_results["webPages"]["value"]]
+    search_results = await _search_custom_bing(
+        session=session, query_params=search_params
+    )
+    values = search_results["webPages"]["value"]
 
-        # Limit the number of concurrent requests
-        semaphore = asyncio.Semaphore(6)
+    # Start every page fetch before doing anything else with the results; concurrency
+    # is bounded by the shared connector's connection limit
+    fetches = [asyncio.create_task(_fetch_content(session, v["url"])) for v in values]
+    contents = await asyncio.gather(*fetches, return_exceptions=True)
 
-        # Fetch content with semaphore to limit concurrency
-        async def fetch_with_semaphore(url: str) -> str:
-            async with semaphore:
-                return await _fetch_content(session, url)
-
-        tasks = [fetch_with_semaphore(url) for url in urls]
-        contents = await asyncio.gather(*tasks)
-
-        # Merge URLs, snippets, and contents into a single list of dictionaries
-        merged_results = [
-            {"url": url, "snippet": snippet, "content": content}
-            for url, snippet, content in zip(urls, snippets, contents)
-        ]
-        logger.info(f"Search results: {merged_results}")
-        return json.dumps(merged_results)
+    # Merge URLs, snippets, and contents into a single list of dictionaries; a page
+    # that failed to load, or whose fetch was cancelled, contributes its snippet only
+    merged_results = []
+    for value, content in zip(values, contents):
+        if isinstance(content, BaseException):
+            logger.warning("Failed to fetch %s: %s", value["url"], content)
+            content = ""
+        merged_results.append(
+            {"url": value["url"], "snippet": value["snippet"], "content": content}
+        )
+    logger.info("Bing search returned %d results", len(merged_results))
+    logger.debug("Search results: %s", merged_results)
+    return orjson.dumps(merged_results).decode()
 
 
 # Utility function to get travel activity tools
@@ -100,9 +157,25 @@ def get_travel_activity_tools() -> List[Tool]:
     ]
 
 
+# Asks the tool loop to finish with a JSON reply that already matches Activities
+ACTIVITIES_SYSTEM_PROMPT = (
+    "You are a helpful AI assistant that can advise on activities. "
+    "When you have gathered enough information, reply only with a JSON object "
+    "matching this JSON schema, without any other text: "
+    + json.dumps(Activities.model_json_schema())
+)
+
+
 # Activities Agent
 @type_subscription("activities_booking")
 class ActivitiesAgent(RoutedAgent):
+    _SYSTEM_MESSAGES: ClassVar[Tuple[LLMMessage, ...]] = (
+        SystemMessage(content=ACTIVITIES_SYSTEM_PROMPT),
+    )
+
+    # Shared by all agent instances so calls from every session share one concurrency bound
+    _formatter: Optional[StructuredCaller] = None
+
     def __init__(
         self,
         model_client: AzureOpenAIChatCompletionClient,
@@ -110,21 +183,25 @@ class ActivitiesAgent(RoutedAgent):
         tool_agent_type: str,
     ) -> None:
         super().__init__("ActivitiesAgent")
-        self._system_messages: List[LLMMessage] = [
-            SystemMessage(
-                content="You are a helpful AI assistant that can advise on activities."
-            )
-        ]
+        self._handoff_template = HandoffMessage(content="", source=self.id.type)
         self._model_client = model_client
         self._tools = tools
         self._tool_agent_id = AgentId(tool_agent_type, self.id.key)
+        if ActivitiesAgent._formatter is None:
+            ActivitiesAgent._formatter = StructuredCaller(
+                model_client,
+                Activities,
+                source="ActivitiesAgent",
+                max_concurrency=Config.LLM_CONCURRENCY,
+            )
 
     async def _process_request(
         self, message_content: str, ctx: MessageContext
     ) -> Activities:
         # Create a session for the activities agent
         session: List[LLMMessage] = [
-            UserMessage(content=message_content, source="user")
+            *self._SYSTEM_MESSAGES,
+            UserMessage(content=message_content, source="user"),
         ]
 
         # Run the caller loop
@@ -138,31 +215,37 @@ class ActivitiesAgent(RoutedAgent):
                 cancellation_token=ctx.cancellation_token,
             )
         except Exception as e:
-            logger.error(f"Tool agent caller loop failed: {str(e)}")
+            logger.error("Tool agent caller loop failed: %s", e)
             return Activities(destination_city="", activities=[])
 
         # Ensure the final message content is a string
         assert isinstance(messages[-1].content, str)
 
+        # The final reply usually conforms to the schema already; only fall back
+        # to a separate structured-output call when it does not
+        candidate = messages[-1].content.strip()
+        if candidate.startswith("{") and candidate.endswith("}"):
+            try:
+                return Activities.model_validate_json(candidate)
+            except ValidationError:
+                pass
+        logger.info("Activities reply was not schema-conformant, reformatting")
+
         # Get structured data from the final message content
         try:
-            response_content = await self._model_client.create(
-                [UserMessage(content=messages[-1].content, source="ActivitiesAgent")],
-                extra_create_args={"response_format": Activities},
-            )
-            return Activities.model_validate(json.loads(response_content.content))
+            return await self._formatter.create(messages[-1].content)
         except Exception as e:
-            logger.error(f"Failed to parse activities response: {str(e)}")
+            logger.error("Failed to parse activities response: %s", e)
             return Activities(destination_city="", activities=[])
 
     @message_handler
     async def handle_message(
         self, message: EndUserMessage, ctx: MessageContext
     ) -> None:
-        if "travel plan" in message.content.lower():
+        if is_travel_plan_request(message.content.lower()):
             # Cannot handle complex travel plans, hand off back to router
             await self.publish_message(
-                HandoffMessage(content=message.content, source=self.id.type),
+                self._handoff_template.model_copy(update={"content": message.content}),
                 DefaultTopicId(type="router", source=ctx.topic_id.source),
             )
             return
@@ -186,7 +269,7 @@ class ActivitiesAgent(RoutedAgent):
         activities_structured = await self._process_request(message.content, ctx)
 
         # send the response to the group chat manager
-        return GroupChatMessage(
+        return GroupChatMessage.model_construct(
             source=self.id.type,
             content=activities_structured.model_dump_json(),
         )
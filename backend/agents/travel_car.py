@@ -1,7 +1,7 @@
 import asyncio
-import datetime
 import random
-from typing import List
+from datetime import date
+from typing import List, Optional
 from autogen_core.tools import FunctionTool, Tool
 from autogen_core import MessageContext
 from autogen_core import (
@@ -10,8 +10,8 @@ from autogen_core import (
     message_handler,
     type_subscription,
 )
-from autogen_core.models import LLMMessage, SystemMessage
 from typing_extensions import Annotated
+from ..config import Config
 from ..data_types import (
     AgentStructuredResponse,
     EndUserMessage,
@@ -19,8 +19,25 @@ from ..data_types import (
     HandoffMessage,
     TravelRequest,
     CarRental,
+    CarRentalRequirements,
 )
 from ..otlp_tracing import logger
+from .common import is_travel_plan_request, make_booking_reference
+
+
+# Simulated rental fleet as (car_type, company, price_per_day), built once at import
+_CAR_OPTIONS = (
+    ("Sedan", "Avis", 50),
+    ("SUV", "Hertz", 80),
+    ("Convertible", "Budget", 100),
+    ("Minivan", "Enterprise", 70),
+    ("Compact", "Thrifty", 40),
+    ("Luxury", "Alamo", 150),
+    ("Pickup Truck", "National", 90),
+    ("Electric", "Tesla Rentals", 120),
+    ("Hybrid", "Green Wheels", 60),
+    ("Sports Car", "Exotic Rentals", 200),
+)
 
 
 async def simulate_car_rental_booking(
@@ -32,40 +49,51 @@ async def simulate_car_rental_booking(
         str, "The end date of the car rental in the format 'YYYY-MM-DD'."
     ],
 ) -> CarRental:
-    car_options = [
-        {"car_type": "Sedan", "company": "Avis", "price_per_day": 50},
-        {"car_type": "SUV", "company": "Hertz", "price_per_day": 80},
-        {"car_type": "Convertible", "company": "Budget", "price_per_day": 100},
-        {"car_type": "Minivan", "company": "Enterprise", "price_per_day": 70},
-        {"car_type": "Compact", "company": "Thrifty", "price_per_day": 40},
-        {"car_type": "Luxury", "company": "Alamo", "price_per_day": 150},
-        {"car_type": "Pickup Truck", "company": "National", "price_per_day": 90},
-        {"car_type": "Electric", "company": "Tesla Rentals", "price_per_day": 120},
-        {"car_type": "Hybrid", "company": "Green Wheels", "price_per_day": 60},
-        {"car_type": "Sports Car", "company": "Exotic Rentals", "price_per_day": 200},
-    ]
-
-    selected_car = random.choice(car_options)
-    start_date = datetime.datetime.strptime(rental_start_date, "%Y-%m-%d")
-    end_date = datetime.datetime.strptime(rental_end_date, "%Y-%m-%d")
-    rental_days = (end_date - start_date).days
-    total_price = rental_days * selected_car["price_per_day"]
-    booking_reference = f"CR-{random.randint(1000, 9999)}-{rental_city[:3].upper()}"
+    car_type, company, price_per_day = random.choice(_CAR_OPTIONS)
+    # A bad date goes back to the model through the tool result so it can retry
+    try:
+        rental_days = (
+            date.fromisoformat(rental_end_date) - date.fromisoformat(rental_start_date)
+        ).days
+    except ValueError as e:
+        raise ValueError(
+            f"Rental dates must be in the format 'YYYY-MM-DD', got "
+            f"{rental_start_date!r} to {rental_end_date!r}"
+        ) from e
+    total_price = rental_days * price_per_day
+    booking_reference = make_booking_reference("CR", rental_city)
 
     car_rental_details = CarRental(
         rental_city=rental_city,
         rental_start_date=rental_start_date,
         rental_end_date=rental_end_date,
-        car_type=selected_car["car_type"],
-        company=selected_car["company"],
+        car_type=car_type,
+        company=company,
         total_price=total_price,
         booking_reference=booking_reference,
     )
 
-    await asyncio.sleep(2)
+    if Config.TRAVEL_SIM_LATENCY:
+        await asyncio.sleep(Config.TRAVEL_SIM_LATENCY)
     return car_rental_details
 
 
+# Known rental cities, keyed by lowercase name
+_RENTAL_CITIES = (("new york", "New York"),)
+
+
+def extract_requirements(
+    content: str, content_lower: Optional[str] = None
+) -> CarRentalRequirements:
+    # You would typically call a LLM to extract the requirement or have a function call here
+    if content_lower is None:
+        content_lower = content.lower()
+    for city, rental_city in _RENTAL_CITIES:
+        if city in content_lower:
+            return CarRentalRequirements(rental_city=rental_city)
+    return CarRentalRequirements()
+
+
 def get_car_rental_tool() -> List[Tool]:
     return [
         FunctionTool(
@@ -80,43 +108,38 @@ def get_car_rental_tool() -> List[Tool]:
 class CarRentalAgent(RoutedAgent):
     def __init__(self) -> None:
         super().__init__("CarRentalAgent")
+        self._handoff_template = HandoffMessage(content="", source=self.id.type)
         logger.info("CarRentalAgent initialized")
-        self._system_messages: List[LLMMessage] = [
-            SystemMessage(
-                content="You are a helpful AI assistant that can advise on car rental bookings based on user preferences."
-            )
-        ]
+
+    async def _build_rental(
+        self, content: str, content_lower: Optional[str] = None
+    ) -> CarRental:
+        requirements = extract_requirements(content, content_lower)
+        return await simulate_car_rental_booking(
+            requirements.rental_city,
+            requirements.rental_start_date,
+            requirements.rental_end_date,
+        )
 
     @message_handler
     async def handle_message(
         self, message: EndUserMessage, ctx: MessageContext
     ) -> None:
-        logger.info(f"CarRentalAgent received message: {message.content}")
-        if "travel plan" in message.content.lower():
+        logger.info("CarRentalAgent received message: %s", message.content)
+        content_lower = message.content.lower()
+        if is_travel_plan_request(content_lower):
             await self.publish_message(
-                HandoffMessage(content=message.content, source=self.id.type),
+                self._handoff_template.model_copy(update={"content": message.content}),
                 DefaultTopicId(type="router", source=ctx.topic_id.source),
             )
             return
 
-        # You would typically call a LLM to extract the requirement or have a function call here
-        requirements = {
-            "rental_city": (
-                "New York" if "new york" in message.content.lower() else "Unknown"
-            ),
-            "rental_start_date": "2023-12-21",
-            "rental_end_date": "2023-12-26",
-        }
-        response = await simulate_car_rental_booking(
-            requirements["rental_city"],
-            requirements["rental_start_date"],
-            requirements["rental_end_date"],
-        )
+        response = await self._build_rental(message.content, content_lower)
         await self.publish_message(
             AgentStructuredResponse(
                 agent_type=self.id.type,
                 data=response,
-                message=f"Car rented: {response}",
+                message="Car rented: " + response.model_dump_json(),
             ),
             DefaultTopicId(type="user_proxy", source=ctx.topic_id.source),
         )
@@ -126,22 +149,10 @@ class CarRentalAgent(RoutedAgent):
         self, message: TravelRequest, ctx: MessageContext
     ) -> GroupChatMessage:
         logger.info(
-            f"CarRentalAgent received travel request: TravelRequest - {message.content}"
-        )
-        requirements = {
-            "rental_city": (
-                "New York" if "new york" in message.content.lower() else "Unknown"
-            ),
-            "rental_start_date": "2023-12-21",
-            "rental_end_date": "2023-12-26",
-        }
-        response = await simulate_car_rental_booking(
-            requirements["rental_city"],
-            requirements["rental_start_date"],
-            requirements["rental_end_date"],
+            "CarRentalAgent received travel request: TravelRequest - %s", message.content
         )
-        return GroupChatMessage(
+        response = await self._build_rental(message.content)
+        return GroupChatMessage.model_construct(
             source=self.id.type,
-            content=f"Car rented: {response}",
-
+            content="Car rented: " + response.model_dump_json(),
         )
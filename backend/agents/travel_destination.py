@@ -1,5 +1,7 @@
-import json
-from typing import List
+import asyncio
+from collections import OrderedDict
+from functools import partial
+from typing import ClassVar, Optional
 
 from autogen_core import MessageContext
 from autogen_core import (
@@ -8,9 +10,9 @@ from autogen_core import (
     message_handler,
     type_subscription,
 )
-from autogen_core.models import LLMMessage, SystemMessage, UserMessage
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
+from ..config import Config
 from ..data_types import (
     AgentStructuredResponse,
     DestinationInfo,
@@ -19,46 +21,71 @@ from ..data_types import (
     TravelRequest,
 )
 from ..otlp_tracing import logger
+from .common import StructuredCaller
 
 
 # Destination Agent
 @type_subscription(topic_type="destination_info")
 class DestinationAgent(RoutedAgent):
+    # Destination info does not depend on the session, so replies are shared by every
+    # instance in the process, keyed by normalized prompt. Entries are detached lookup
+    # tasks, so identical requests that arrive while one is in flight wait on the same
+    # call, and no single caller's cancellation can cancel it for the others.
+    _CACHE_SIZE: ClassVar[int] = 1024
+    _info_cache: ClassVar["OrderedDict[str, asyncio.Task]"] = OrderedDict()
+
+    # Shared by all agent instances so calls from every session share one concurrency bound
+    _caller: Optional[StructuredCaller] = None
+
     def __init__(
         self,
         model_client: AzureOpenAIChatCompletionClient,
     ) -> None:
         super().__init__("DestinationAgent")
-        self._system_messages: List[LLMMessage] = [
-            SystemMessage(
-                content="You are a helpful AI assistant that helps with destination information."
-            )
-        ]
         self._model_client = model_client
+        if DestinationAgent._caller is None:
+            DestinationAgent._caller = StructuredCaller(
+                model_client,
+                DestinationInfo,
+                source="DestinationAgent",
+                max_concurrency=Config.LLM_CONCURRENCY,
+            )
+
+    async def _get_destination_info(self, prompt: str) -> DestinationInfo:
+        key = prompt.strip().lower()
+        lookup = self._info_cache.get(key)
+        if lookup is not None:
+            self._info_cache.move_to_end(key)
+        else:
+            lookup = asyncio.create_task(self._caller.create(prompt))
+            lookup.add_done_callback(partial(self._forget_failed_lookup, key))
+            self._info_cache[key] = lookup
+            if len(self._info_cache) > self._CACHE_SIZE:
+                self._info_cache.popitem(last=False)
+        return await asyncio.shield(lookup)
+
+    @classmethod
+    def _forget_failed_lookup(cls, key: str, lookup: asyncio.Task) -> None:
+        # Failures are not cached, but callers already waiting see the same error;
+        # reading the exception here also marks it retrieved when nobody is waiting
+        if lookup.cancelled() or lookup.exception() is not None:
+            if cls._info_cache.get(key) is lookup:
+                del cls._info_cache[key]
 
     @message_handler
     async def handle_message(
         self, message: EndUserMessage, ctx: MessageContext
     ) -> None:
         logger.info(
-            f"DestinationAgent received travel request: EndUserMessage {message.content}"
+            "DestinationAgent received travel request: EndUserMessage %s", message.content
         )
         # Provide destination information
         try:
-            response_content = await self._model_client.create(
-                [
-                    UserMessage(
-                        content=f"Provide info for {message.content}",
-                        source="DestinationAgent",
-                    )
-                ],
-                extra_create_args={"response_format": DestinationInfo},
-            )
-            destination_info_structured = DestinationInfo.model_validate(
-                json.loads(response_content.content)
+            destination_info_structured = await self._get_destination_info(
+                f"Provide info for {message.content}"
             )
         except Exception as e:
-            logger.error(f"Failed to parse destination response: {str(e)}")
+            logger.error("Failed to parse destination response: %s", e)
             destination_info_structured = DestinationInfo()
 
         await self.publish_message(
@@ -75,27 +102,18 @@ class DestinationAgent(RoutedAgent):
         self, message: TravelRequest, ctx: MessageContext
     ) -> GroupChatMessage:
         logger.info(
-            f"DestinationAgent received travel request: TravelRequest: {message.content}"
+            "DestinationAgent received travel request: TravelRequest: %s", message.content
         )
         # Provide destination information
         try:
-            response_content = await self._model_client.create(
-                [
-                    UserMessage(
-                        content=f"You have been given a subtask: {message.content} as part of a travel plan. The initial task is {message.original_task}",
-                        source="DestinationAgent",
-                    )
-                ],
-                extra_create_args={"response_format": DestinationInfo},
-            )
-            destination_info_structured = DestinationInfo.model_validate(
-                json.loads(response_content.content)
+            destination_info_structured = await self._get_destination_info(
+                f"You have been given a subtask: {message.content} as part of a travel plan. The initial task is {message.original_task}"
             )
         except Exception as e:
-            logger.error(f"Failed to parse destination response: {str(e)}")
+            logger.error("Failed to parse destination response: %s", e)
             destination_info_structured = DestinationInfo()
 
-        return GroupChatMessage(
+        return GroupChatMessage.model_construct(
             source=self.id.type,
             content=destination_info_structured.model_dump_json(),
         )
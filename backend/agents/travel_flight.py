@@ -21,6 +21,17 @@ from ..data_types import (
     AgentStructuredResponse,
 )
 from ..otlp_tracing import logger
+from .common import is_travel_plan_request, make_booking_reference
+
+
+# Simulated flights as (airline, flight_number, price_per_ticket), built once at import
+_FLIGHT_OPTIONS = (
+    ("Air France", "AF123", 200),
+    ("Delta", "DL456", 250),
+    ("British Airways", "BA789", 300),
+    ("Lufthansa", "LH101", 220),
+    ("Emirates", "EK202", 400),
+)
 
 
 async def simulate_flight_booking(
@@ -30,31 +41,17 @@ async def simulate_flight_booking(
     return_date: str = "2023-12-30",
     number_of_passengers: int = 2,
 ) -> FlightBooking:
-    flight_options = [
-        {"airline": "Air France", "flight_number": "AF123", "price_per_ticket": 200},
-        {"airline": "Delta", "flight_number": "DL456", "price_per_ticket": 250},
-        {
-            "airline": "British Airways",
-            "flight_number": "BA789",
-            "price_per_ticket": 300,
-        },
-        {"airline": "Lufthansa", "flight_number": "LH101", "price_per_ticket": 220},
-        {"airline": "Emirates", "flight_number": "EK202", "price_per_ticket": 400},
-    ]
-
-    selected_flight = random.choice(flight_options)
-    total_price = 2 * selected_flight["price_per_ticket"]
-    booking_reference = (
-        f"FL-{random.randint(1000, 9999)}-{destination_city[:3].upper()}"
-    )
+    airline, flight_number, price_per_ticket = random.choice(_FLIGHT_OPTIONS)
+    total_price = 2 * price_per_ticket
+    booking_reference = make_booking_reference("FL", destination_city)
 
     return FlightBooking(
         departure_city=departure_city,
         destination_city=destination_city,
         departure_date=departure_date,
         return_date=return_date,
-        airline=selected_flight["airline"],
-        flight_number=selected_flight["flight_number"],
+        airline=airline,
+        flight_number=flight_number,
         total_price=total_price,
         booking_reference=booking_reference,
         number_of_passengers=number_of_passengers,
@@ -78,15 +75,16 @@ def get_flight_booking_tool() -> List[Tool]:
 class FlightAgent(RoutedAgent):
     def __init__(self) -> None:
         super().__init__("FlightAgent")
+        self._handoff_template = HandoffMessage(content="", source=self.id.type)
 
     @message_handler
     async def handle_message(
         self, message: EndUserMessage, ctx: MessageContext
     ) -> None:
         try:
-            if "travel plan" in message.content.lower():
+            if is_travel_plan_request(message.content.lower()):
                 await self.publish_message(
-                    HandoffMessage(content=message.content, source=self.id.type),
+                    self._handoff_template.model_copy(update={"content": message.content}),
                     DefaultTopicId(type="router", source=ctx.topic_id.source),
                 )
                 return
@@ -101,11 +99,8 @@ class FlightAgent(RoutedAgent):
             target_topic = DefaultTopicId(type="user_proxy", source=ctx.topic_id.source)
             await self.publish_message(structured_response, target_topic)
             
-        except Exception as e:
-            logger.error("Error in FlightAgent.handle_message")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error message: {str(e)}")
-            logger.error("Error details:", exc_info=True)
+        except Exception:
+            logger.exception("Error in FlightAgent.handle_message")
 
     @message_handler
     async def handle_travel_request(
@@ -113,14 +108,11 @@ class FlightAgent(RoutedAgent):
     ) -> GroupChatMessage:
         try:
             response = await simulate_flight_booking()
-            return GroupChatMessage(
+            return GroupChatMessage.model_construct(
                 source=self.id.type,
-                content=f"Flight booking processed: {response}",
+                content="Flight booking processed: " + response.model_dump_json(),
             )
             
-        except Exception as e:
-            logger.error("Error in FlightAgent.handle_travel_request")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error message: {str(e)}")
-            logger.error("Error details:", exc_info=True)
+        except Exception:
+            logger.exception("Error in FlightAgent.handle_travel_request")
             raise
@@ -1,8 +1,9 @@
 import asyncio
-from collections import defaultdict
-from typing import List
+from functools import partial
+from typing import Awaitable, Callable, ClassVar, Dict, List, TypeVar
+from weakref import WeakKeyDictionary
 
-from autogen_core import AgentId, MessageContext
+from autogen_core import AgentId, AgentRuntime, MessageContext
 from autogen_core import (
     DefaultTopicId,
     RoutedAgent,
@@ -10,6 +11,7 @@ from autogen_core import (
     type_subscription,
 )
 
+from ..config import Config
 from ..data_types import (
     AgentStructuredResponse,
     EndUserMessage,
@@ -20,6 +22,8 @@ from ..data_types import (
 )
 from ..otlp_tracing import logger
 
+T = TypeVar("T")
+
 
 @type_subscription("group_chat_manager")
 class GroupChatManager(RoutedAgent):
@@ -27,18 +31,30 @@ class GroupChatManager(RoutedAgent):
     Manages communication between multiple agents involved in creating a travel plan.
 
     Attributes:
-        _chat_history (List[GroupChatMessage]): Stores messages exchanged during the chat.
         _conversation_complete (bool): Indicates if the conversation is complete.
         _session_id (str): Stores the current session ID.
-        _responses (defaultdict): Stores agent responses for compiling the final travel plan.
+        _responses (Dict[str, List[GroupChatMessage]]): Stores agent responses for compiling the final travel plan.
     """
 
+    # Shared by every session of a runtime so the model's rate limit is what gets
+    # bounded, not each plan on its own; created on first use, per runtime
+    _llm_sems: ClassVar["WeakKeyDictionary[AgentRuntime, asyncio.Semaphore]"] = (
+        WeakKeyDictionary()
+    )
+
     def __init__(self) -> None:
         super().__init__("GroupChatManager")
-        self._chat_history: List[GroupChatMessage] = []
         self._conversation_complete = False
         self._session_id = None
-        self._responses = defaultdict(list)
+        self._responses: Dict[str, List[GroupChatMessage]] = {}
+
+    async def _bounded(self, call: Callable[[], Awaitable[T]]) -> T:
+        # Takes a factory so nothing is created for a task cancelled while queued
+        sem = self._llm_sems.get(self.runtime)
+        if sem is None:
+            sem = self._llm_sems[self.runtime] = asyncio.Semaphore(Config.LLM_CONCURRENCY)
+        async with sem:
+            return await call()
 
     @message_handler
     async def handle_travel_request(
@@ -65,10 +81,10 @@ class GroupChatManager(RoutedAgent):
             message (TravelPlan): The incoming travel plan request containing multiple tasks.
             ctx (MessageContext): The context of the current message.
         """
+        agent_type = self.id.type
+        session_id = self._session_id = ctx.topic_id.source
+        tasks: List[asyncio.Task] = []
         try:
-            self._session_id = ctx.topic_id.source
-            tasks = []
-            
             for task in message.subtasks:
                 try:
                     if isinstance(task, dict):
@@ -83,40 +99,78 @@ class GroupChatManager(RoutedAgent):
                         content=task_details,
                         original_task=message.main_task,
                     )
-                    agent_id = AgentId(type=assigned_agent, key=self._session_id)
+                    agent_id = AgentId(type=assigned_agent, key=session_id)
                     
+                    # Start each send now so it runs while later subtasks are prepared
                     tasks.append(
-                        self.send_message(travel_request, agent_id)
+                        asyncio.create_task(
+                            self._bounded(
+                                partial(self.send_message, travel_request, agent_id)
+                            )
+                        )
                     )
                     
-                except Exception as e:
-                    logger.error(f"Error creating task")
-                    logger.error(f"Task data: {task}")
-                    logger.error(f"Error type: {type(e)}")
-                    logger.error(f"Error message: {str(e)}")
-                    logger.error("Error details:", exc_info=True)
+                except Exception:
+                    logger.exception("Error creating task from %s", task)
                     continue
 
-            group_results: List[GroupChatMessage] = await asyncio.gather(*tasks)
-            final_plan = "\n".join([response.content for response in group_results])
-
+            # Forward each agent's part as soon as it arrives so the user sees progress
+            # while slower subtasks are still running
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result: GroupChatMessage = await next_done
+                except asyncio.CancelledError:
+                    # A cancelled subtask is skipped; cancelling this handler is not
+                    if asyncio.current_task().cancelling():
+                        raise
+                    logger.warning("Travel plan subtask was cancelled")
+                    continue
+                except Exception:
+                    logger.exception("Travel plan subtask failed")
+                    continue
+                try:
+                    await self.publish_message(
+                        AgentStructuredResponse(
+                            agent_type=agent_type,
+                            data=result,
+                            message=f"Travel plan update from {result.source}:\n{result.content}",
+                            progress=True,
+                        ),
+                        DefaultTopicId(type="user_proxy", source=session_id),
+                    )
+                except Exception:
+                    logger.exception("Failed to publish travel plan update from %s", result.source)
+
+        except Exception:
+            logger.exception("Error in handle_complex_travel_request")
+        finally:
+            # Subtasks still running after a failure or cancellation would be orphaned
+            for task in tasks:
+                task.cancel()
+
+        # The compiled plan keeps the subtask order of the request and is sent even when
+        # some subtasks or updates failed
+        final_plan = "\n".join(
+            [
+                task.result().content
+                for task in tasks
+                if task.done() and not task.cancelled() and task.exception() is None
+            ]
+        )
+        try:
             await self.publish_message(
                 AgentStructuredResponse(
-                    agent_type=self.id.type,
-                    data=GroupChatMessage(
-                        source=self.id.type,
+                    agent_type=agent_type,
+                    data=GroupChatMessage.model_construct(
+                        source=agent_type,
                         content=final_plan,
                     ),
                     message=f"Here is your comprehensive travel plan:\n{final_plan}",
                 ),
-                DefaultTopicId(type="user_proxy", source=ctx.topic_id.source),
+                DefaultTopicId(type="user_proxy", source=session_id),
             )
-            
-        except Exception as e:
-            logger.error("Error in handle_complex_travel_request")
-            logger.error(f"Error type: {type(e)}")
-            logger.error(f"Error message: {str(e)}")
-            logger.error("Error details:", exc_info=True)
+        except Exception:
+            logger.exception("Failed to publish the compiled travel plan")
 
     async def request_relevant_agents(self, relevant_agents: List[str]) -> None:
         """
@@ -125,15 +179,24 @@ class GroupChatManager(RoutedAgent):
         Args:
             relevant_agents (List[str]): The list of agent types involved in the travel plan.
         """
-        for agent_type in relevant_agents:
-            await self.publish_message(
-                TravelRequest(
-                    source="GroupChatManager",
-                    content="Provide details for the travel plan",
-                    original_task="General travel plan",
-                ),
-                DefaultTopicId(type=agent_type, source=self._session_id),
-            )
+        travel_request = TravelRequest(
+            source="GroupChatManager",
+            content="Provide details for the travel plan",
+            original_task="General travel plan",
+        )
+        results = await asyncio.gather(
+            *(
+                self.publish_message(
+                    travel_request,
+                    DefaultTopicId(type=agent_type, source=self._session_id),
+                )
+                for agent_type in relevant_agents
+            ),
+            return_exceptions=True,
+        )
+        for agent_type, result in zip(relevant_agents, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to publish travel request to %s: %s", agent_type, result)
 
     @message_handler
     async def handle_handoff(self, message: TravelRequest, ctx: MessageContext) -> None:
@@ -155,7 +218,7 @@ class GroupChatManager(RoutedAgent):
         Compiles the final travel plan based on collected responses from agents.
         """
         final_plan = "\n".join(
-            response.content for response in self._responses[self._session_id]
+            response.content for response in self._responses.get(self._session_id, ())
         )
         await self.publish_message(
             AgentStructuredResponse(
@@ -1,6 +1,6 @@
-import datetime
 import random
-from typing import Dict, List
+from datetime import date
+from typing import List, Optional, Tuple
 
 from autogen_core import AgentId, MessageContext
 from autogen_core import (
@@ -9,10 +9,15 @@ from autogen_core import (
     message_handler,
     type_subscription,
 )
-from autogen_core.models import LLMMessage, SystemMessage, UserMessage
+from autogen_core.models import (
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    UserMessage,
+)
 from autogen_core.tool_agent import tool_agent_caller_loop
 from autogen_core.tools import FunctionTool, Tool
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+from pydantic import ValidationError
 from typing_extensions import Annotated
 
 from ..data_types import (
@@ -24,6 +29,17 @@ from ..data_types import (
     HotelBooking,
 )
 from ..otlp_tracing import logger
+from .common import is_travel_plan_request, make_booking_reference
+
+
+# Simulated hotels as (hotel_name, room_type, price_per_night), built once at import
+_HOTEL_OPTIONS = (
+    ("Hilton", "Deluxe", 200),
+    ("Marriott", "Standard", 150),
+    ("Hyatt", "Suite", 300),
+    ("Sheraton", "Executive", 250),
+    ("Holiday Inn", "Standard", 100),
+)
 
 
 async def create_hotel_booking(
@@ -35,43 +51,43 @@ async def create_hotel_booking(
         str, "The check-out date of the hotel booking in the format 'YYYY-MM-DD'."
     ],
 ) -> HotelBooking:
-    # Simulate available hotel options
     logger.info(
-        f"Function call: Creating hotel booking for {city} from {check_in_date} to {check_out_date}"
+        "Function call: Creating hotel booking for %s from %s to %s",
+        city,
+        check_in_date,
+        check_out_date,
     )
-    hotel_options = [
-        {"hotel_name": "Hilton", "room_type": "Deluxe", "price_per_night": 200},
-        {"hotel_name": "Marriott", "room_type": "Standard", "price_per_night": 150},
-        {"hotel_name": "Hyatt", "room_type": "Suite", "price_per_night": 300},
-        {"hotel_name": "Sheraton", "room_type": "Executive", "price_per_night": 250},
-        {"hotel_name": "Holiday Inn", "room_type": "Standard", "price_per_night": 100},
-    ]
-
-    # Randomly select a hotel option
-    selected_hotel = random.choice(hotel_options)
-
-    # Calculate the number of nights
-    check_in = datetime.datetime.strptime(check_in_date, "%Y-%m-%d")
-    check_out = datetime.datetime.strptime(check_out_date, "%Y-%m-%d")
-    num_nights = (check_out - check_in).days
+    hotel_name, room_type, price_per_night = random.choice(_HOTEL_OPTIONS)
+
+    # Calculate the number of nights; a bad date goes back to the model through the
+    # tool result so it can retry with corrected arguments
+    try:
+        num_nights = (
+            date.fromisoformat(check_out_date) - date.fromisoformat(check_in_date)
+        ).days
+    except ValueError as e:
+        raise ValueError(
+            f"Hotel dates must be in the format 'YYYY-MM-DD', got "
+            f"{check_in_date!r} to {check_out_date!r}"
+        ) from e
 
     # Calculate total price for the stay
-    total_price = num_nights * selected_hotel["price_per_night"]
+    total_price = num_nights * price_per_night
 
     # Create a booking reference number
-    booking_reference = f"HT-{random.randint(1000, 9999)}-{city[:3].upper()}"
+    booking_reference = make_booking_reference("HT", city)
 
     hotel_booking_details = HotelBooking(
         city=city,
         check_in_date=check_in_date,
         check_out_date=check_out_date,
-        hotel_name=selected_hotel["hotel_name"],
-        room_type=selected_hotel["room_type"],
+        hotel_name=hotel_name,
+        room_type=room_type,
         total_price=total_price,
         booking_reference=booking_reference,
     )
 
-    logger.info(f"Hotel booking details: {hotel_booking_details}")
+    logger.info("Hotel booking details: %s", hotel_booking_details)
 
     return hotel_booking_details
 
@@ -85,6 +101,18 @@ def get_hotel_booking_tool() -> List[Tool]:
     ]
 
 
+# The tool agent returns create_hotel_booking results as HotelBooking JSON
+def _extract_booking(messages: List[LLMMessage]) -> Optional[HotelBooking]:
+    for message in reversed(messages):
+        if isinstance(message, FunctionExecutionResultMessage):
+            for result in reversed(message.content):
+                try:
+                    return HotelBooking.model_validate_json(result.content)
+                except ValidationError:
+                    continue
+    return None
+
+
 # Hotel Agent with Handoff Logic
 @type_subscription("hotel_booking")
 class HotelAgent(RoutedAgent):
@@ -95,14 +123,14 @@ class HotelAgent(RoutedAgent):
         tool_agent_type: str,
     ) -> None:
         super().__init__("HotelAgent")
-        self._system_messages: List[LLMMessage] = [
-            SystemMessage(content="You are a helpful AI assistant that can make hotel booking.")
-        ]
+        self._handoff_template = HandoffMessage(content="", source=self.id.type)
         self._model_client = model_client
         self._tools = tools
         self._tool_agent_id = AgentId(tool_agent_type, self.id.key)
 
-    async def _process_request(self, message_content: str, ctx: MessageContext) -> str:
+    async def _process_request(
+        self, message_content: str, ctx: MessageContext
+    ) -> Tuple[str, Optional[HotelBooking]]:
         # Create a session for the activities agent
         session: List[LLMMessage] = [
             UserMessage(content=message_content, source="user")
@@ -117,41 +145,35 @@ class HotelAgent(RoutedAgent):
                 tool_schema=self._tools,
                 cancellation_token=ctx.cancellation_token,
             )
-            logger.info(f"Tool agent caller loop completed: {messages}")
+            logger.info("Tool agent caller loop completed with %d messages", len(messages))
+            logger.debug("Tool agent caller loop messages: %s", messages)
         except Exception as e:
-            logger.error(f"Tool agent caller loop failed: {str(e)}")
-            return "Failed to book hotel. Please try again."
+            logger.error("Tool agent caller loop failed: %s", e)
+            return "Failed to book hotel. Please try again.", None
 
         # Ensure the final message content is a string
         assert isinstance(messages[-1].content, str)
-        return messages[-1].content
+        return messages[-1].content, _extract_booking(messages)
 
     @message_handler
     async def handle_message(
         self, message: EndUserMessage, ctx: MessageContext
     ) -> None:
-        logger.info(f"HotelAgent received message - EndUserMessage: {message.content}")
-        if "travel plan" in message.content.lower():
+        logger.info("HotelAgent received message - EndUserMessage: %s", message.content)
+        if is_travel_plan_request(message.content.lower()):
             # Cannot handle complex travel plans, hand off back to router
             await self.publish_message(
-                HandoffMessage(content=message.content, source=self.id.type),
+                self._handoff_template.model_copy(update={"content": message.content}),
                 DefaultTopicId(type="router", source=ctx.topic_id.source),
             )
             return
 
-        response_content = await self._process_request(message.content, ctx)
-        simulated_func_call = await create_hotel_booking(
-            city="Singapore",
-            check_in_date=datetime.datetime.now().strftime("%Y-%m-%d"),
-            check_out_date=(
-                datetime.datetime.now() + datetime.timedelta(days=5)
-            ).strftime("%Y-%m-%d"),
-        )
+        response_content, booking = await self._process_request(message.content, ctx)
         # Publish the response to the user proxy
         await self.publish_message(
             AgentStructuredResponse(
                 agent_type=self.id.type,
-                data=simulated_func_call,
+                data=booking,
                 message=f"{response_content}",
             ),
             DefaultTopicId(type="user_proxy", source=ctx.topic_id.source),
@@ -162,20 +184,12 @@ class HotelAgent(RoutedAgent):
         self, message: TravelRequest, ctx: MessageContext
     ) -> GroupChatMessage:
         logger.info(
-            f"HotelAgent received travel request - TravelRequest: {message.content}"
-        )
-        response_content = await self._process_request(message.content, ctx)
-        logger.info(f"HotelAgent response: {response_content}")
-
-        simulated_func_call = await create_hotel_booking(
-            city="Singapore",
-            check_in_date=datetime.datetime.now().strftime("%Y-%m-%d"),
-            check_out_date=(
-                datetime.datetime.now() + datetime.timedelta(days=5)
-            ).strftime("%Y-%m-%d"),
+            "HotelAgent received travel request - TravelRequest: %s", message.content
         )
+        response_content, _ = await self._process_request(message.content, ctx)
+        logger.info("HotelAgent response: %s", response_content)
 
-        return GroupChatMessage(
+        return GroupChatMessage.model_construct(
             source=self.id.type,
             content=f"{response_content}",
         )
@@ -1,6 +1,7 @@
-import json
-from collections import deque
+from collections import OrderedDict, deque
+from typing import ClassVar
 import asyncio
+import re
 
 from autogen_core import MessageContext
 from autogen_core import (
@@ -9,7 +10,7 @@ from autogen_core import (
     message_handler,
     type_subscription,
 )
-from autogen_core.models import SystemMessage
+from autogen_core.models import SystemMessage, UserMessage
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 
 from ..data_types import (
@@ -25,6 +26,40 @@ from ..session_state import SessionStateManager
 
 agent_registry = AgentRegistry()
 
+# A message is a greeting when it opens with one; matching whole words keeps "hi" in
+# "Chicago" or "this" from turning a travel request into a greeting
+_GREETING_RE = re.compile(r"^\s*(?:(?:hello|hi|hey)\b|你好|您好|嗨)", re.IGNORECASE)
+
+# Static planner instructions, sent as their own system message ahead of the varying
+# history and user input so the provider can reuse its cached prompt prefix
+_PLANNER_PREAMBLE = """
+        你是一个智能旅行助手。请根据用户的输入确定合适的处理方式并返回JSON格式响应。
+
+        请严格按照以下JSON格式返回：
+        {
+            "main_task": "用户的主要任务描述",
+            "subtasks": [
+                {
+                    "task_details": "具体任务描述",
+                    "assigned_agent": "处理该任务的代理名称"
+                }
+            ],
+            "is_greeting": true/false
+        }
+
+        规则：
+        1. 对于问候语（如"你好"、"hello"等），设置 is_greeting 为 true，使用 default_agent
+        2. 对于旅行相关问题，创建相应的任务并分配给适当的代理：
+           - 目的地信息查询 → destination_info
+           - 航班预订相关 → flight_booking
+           - 酒店预订相关 → hotel_booking
+           - 租车服务相关 → car_rental
+           - 活动和景点相关 → activities_booking
+        3. 其他一般性问题使用 default_agent 处理
+        """
+
+_PLANNER_SYSTEM_MESSAGE = SystemMessage(content=_PLANNER_PREAMBLE)
+
 
 @type_subscription(topic_type="router")
 class SemanticRouterAgent(RoutedAgent):
@@ -35,10 +70,14 @@ class SemanticRouterAgent(RoutedAgent):
         name (str): Name of the agent.
         model_client (AzureOpenAIChatCompletionClient): The model client for agent routing.
         agent_registry (AgentRegistry): The registry containing agent information.
-        intent_classifier (IntentClassifier): Classifier to determine intent from user messages.
         session_manager (SessionStateManager): Manages the session state for each user.
     """
 
+    # The instructions are fixed, so a plan depends only on the history and message;
+    # identical prompts from any session reuse the parsed plan instead of asking again
+    _PLAN_CACHE_SIZE: ClassVar[int] = 512
+    _plan_cache: ClassVar["OrderedDict[str, TravelPlan]"] = OrderedDict()
+
     def __init__(
         self,
         name: str,
@@ -67,11 +106,11 @@ class SemanticRouterAgent(RoutedAgent):
         self._session_manager.add_to_history(session_id, message)
 
         # Analyze conversation history for better context
-        history = self._session_manager.get_history(session_id)
+        history = self._session_manager.get_history_lines(session_id)
         logger.info("Analyzing conversation history for context")
 
         travel_plan: TravelPlan = await self._get_agents_to_route(message, history)
-        logger.info(f"Routing message to agents: {travel_plan}")
+        logger.info("Routing message to agents: %s", travel_plan)
 
         if travel_plan.is_greeting:
             logger.info("User greeting detected")
@@ -101,14 +140,14 @@ class SemanticRouterAgent(RoutedAgent):
                 DefaultTopicId(type=assigned_agent, source=session_id),
             )
             
-            logger.info(f"Message published successfully to {assigned_agent}")
+            logger.info("Message published successfully to %s", assigned_agent)
             
         else:
             # If more than one agent is involved, send the message to GroupChatManager for coordination
             #logger.info(
             #    f"Routing message to GroupChatManager for coordination: {[subtask.assigned_agent for subtask in travel_plan.subtasks]}"
             #)
-            logger.info(f"Routing message to GroupChatManager for coordination: {travel_plan}")
+            logger.info("Routing message to GroupChatManager for coordination: %s", travel_plan)
             await self.publish_message(
                 travel_plan,
                 DefaultTopicId(type="group_chat_manager", source=session_id),
@@ -126,7 +165,7 @@ class SemanticRouterAgent(RoutedAgent):
             ctx (MessageContext): Context information for the message.
         """
         session_id = ctx.topic_id.source
-        logger.info(f"Received handoff message from {message.source}")
+        logger.info("Received handoff message from %s", message.source)
 
         # Clear session if conversation is complete, otherwise continue routing
         if message.original_task and "complete" in message.content.lower():
@@ -136,80 +175,29 @@ class SemanticRouterAgent(RoutedAgent):
                 EndUserMessage(content=message.content, source=message.source), ctx
             )
 
-    def _build_system_message(self, message: EndUserMessage, history: deque) -> str:
-        """构建系统消息，包含期望的 JSON 结构说明"""
-        base_prompt = """
-        你是一个智能旅行助手。请根据用户的输入确定合适的处理方式并返回JSON格式响应。
-
-        请严格按照以下JSON格式返回：
-        {
-            "main_task": "用户的主要任务描述",
-            "subtasks": [
-                {
-                    "task_details": "具体任务描述",
-                    "assigned_agent": "处理该任务的代理名称"
-                }
-            ],
-            "is_greeting": true/false
-        }
-
-        规则：
-        1. 对于问候语（如"你好"、"hello"等），设置 is_greeting 为 true，使用 default_agent
-        2. 对于旅行相关问题，创建相应的任务并分配给适当的代理：
-           - 目的地信息查询 → destination_info
-           - 航班预订相关 → flight_booking
-           - 酒店预订相关 → hotel_booking
-           - 租车服务相关 → car_rental
-           - 活动和景点相关 → activities_booking
-        3. 其他一般性问题使用 default_agent 处理
-        """
-
+    def _build_user_prompt(self, message: EndUserMessage, history: deque) -> str:
+        """构建用户消息，包含对话历史和用户输入"""
+        parts = []
         if history:
-            context = "\n当前对话历史：\n" + "\n".join([f"- {msg}" for msg in history])
-            base_prompt += f"\n{context}"
+            parts.append("当前对话历史：\n")
+            parts.append("\n".join(history))
+            parts.append("\n\n")
+        parts.append("用户输入：")
+        parts.append(message.content)
+        user_prompt = "".join(parts)
 
-        base_prompt += f"\n\n用户输入：{message.content}"
-        
-        logger.debug(f"Built system message: {base_prompt}")
-        return base_prompt
+        logger.debug("Built user prompt: %s", user_prompt)
+        return user_prompt
 
     async def _get_agents_to_route(
         self, message: EndUserMessage, history: deque
     ) -> TravelPlan:
         try:
-            system_message = self._build_system_message(message, history)
-            logger.debug(f"System message: {system_message}")
-
-            # 简化的响应格式设置
-            response = await self._model_client.create(
-                [SystemMessage(content=system_message)],
-                extra_create_args={
-                    "response_format": {"type": "json_object"}  # 只指定类型为 json_object
-                },
-            )
-            
-            logger.debug(f"Raw response content: {response.content}")
-            
-            try:
-                if isinstance(response.content, str):
-                    content_dict = json.loads(response.content)
-                else:
-                    content_dict = response.content
-                    
-                travel_plan = TravelPlan.model_validate(content_dict)
-                logger.info(f"Successfully parsed travel plan: {travel_plan}")
-                
-            except Exception as parse_error:
-                logger.error(f"Error parsing response: {parse_error}", exc_info=True)
-                travel_plan = TravelPlan(
-                    main_task=message.content,
-                    subtasks=[],
-                    is_greeting=False
-                )
-
-            if any(greeting in message.content.lower() for greeting in ["hello", "hi", "你好"]):
-                logger.info("Greeting detected, updating travel plan")
-                travel_plan = TravelPlan(
+            # Greetings always get the canned plan, so decide them before paying for
+            # a planner call whose answer would be replaced anyway
+            if _GREETING_RE.match(message.content):
+                logger.info("Greeting detected, skipping planner")
+                return TravelPlan(
                     main_task="Greeting",
                     subtasks=[{
                         "task_details": f"Greeting - {message.content}",
@@ -218,23 +206,66 @@ class SemanticRouterAgent(RoutedAgent):
                     is_greeting=True
                 )
 
+            user_prompt = self._build_user_prompt(message, history)
+
+            travel_plan = self._plan_cache.get(user_prompt)
+            if travel_plan is not None:
+                self._plan_cache.move_to_end(user_prompt)
+                logger.info("Reusing cached travel plan: %s", travel_plan)
+            else:
+                travel_plan = await self._plan_with_model(message, user_prompt)
+
             return travel_plan
 
         except Exception as e:
-            logger.error(f"Failed to route message: {str(e)}", exc_info=True)
+            logger.error("Failed to route message: %s", e, exc_info=True)
             return TravelPlan(
                 main_task="",
                 subtasks=[],
                 is_greeting=False
             )
 
+    async def _plan_with_model(
+        self, message: EndUserMessage, user_prompt: str
+    ) -> TravelPlan:
+        # 简化的响应格式设置
+        response = await self._model_client.create(
+            [_PLANNER_SYSTEM_MESSAGE, UserMessage(content=user_prompt, source="user")],
+            extra_create_args={
+                "response_format": {"type": "json_object"}  # 只指定类型为 json_object
+            },
+        )
+
+        logger.debug("Raw response content: %s", response.content)
+
+        try:
+            if isinstance(response.content, str):
+                travel_plan = TravelPlan.model_validate_json(response.content)
+            else:
+                travel_plan = TravelPlan.model_validate(response.content)
+            logger.debug("Successfully parsed travel plan: %s", travel_plan)
+
+        except Exception as parse_error:
+            logger.error("Error parsing response: %s", parse_error, exc_info=True)
+            # Fallback plans are not cached so the next identical prompt retries the model
+            return TravelPlan(
+                main_task=message.content,
+                subtasks=[],
+                is_greeting=False
+            )
+
+        self._plan_cache[user_prompt] = travel_plan
+        if len(self._plan_cache) > self._PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+        return travel_plan
+
     async def _debug_publish(self, message, topic_id):
-        logger.info(f"Publishing message to {topic_id.type}")
-        logger.info(f"Available subscriptions: {self._runtime.list_subscriptions()}")  # 需要确保有这个方法
+        logger.info("Publishing message to %s", topic_id.type)
+        logger.info("Available subscriptions: %s", self._runtime.list_subscriptions())  # 需要确保有这个方法
         
         try:
             await self.publish_message(message, topic_id)
             logger.info("Message published successfully")
         except Exception as e:
-            logger.error(f"Failed to publish message: {e}")
+            logger.error("Failed to publish message: %s", e)
             raise
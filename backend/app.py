@@ -5,7 +5,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import asyncio
-import uuid
+import itertools
+import secrets
 from contextlib import asynccontextmanager
 from typing import Dict, Union
 
@@ -20,6 +21,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from starlette.websockets import WebSocketState
 
+from backend.agents.travel_activities import close_http_session
 from backend.data_types import AgentResponse, EndUserMessage, AgentStructuredResponse
 from backend.otlp_tracing import logger
 from backend.utils import initialize_agent_runtime
@@ -44,6 +46,7 @@ async def lifespan(app: FastAPI):
     yield  # This separates the startup and shutdown logic
 
     # Cleanup logic goes here
+    await close_http_session()
     agent_runtime = None
     user_proxy_agent_instance = None
 
@@ -58,14 +61,24 @@ FastAPIInstrumentor.instrument_app(app)
 agent_runtime = None
 user_proxy_agent_instance = None  # Global variable to store the UserProxyAgent instance
 
+# Chat ids only correlate log lines, so a per-process prefix plus a counter is enough
+_CHAT_ID_PREFIX = secrets.token_hex(4)
+_chat_id_counter = itertools.count()
+
 
 class WebSocketConnectionManager:
     """
     Manages WebSocket connections for user sessions.
+
+    Outbound messages are queued per session and written by a dedicated sender task,
+    so agents never wait on a slow client. Once ``outbox_size`` messages are waiting,
+    progress updates are dropped; every other message is always queued.
     """
 
-    def __init__(self):
+    def __init__(self, outbox_size: int = 100):
         self.connections: Dict[str, WebSocket] = {}
+        self.outboxes: Dict[str, asyncio.Queue] = {}
+        self.outbox_size = outbox_size
 
     def add_connection(self, session_id: str, websocket: WebSocket) -> None:
         """
@@ -76,6 +89,7 @@ class WebSocketConnectionManager:
             websocket (WebSocket): The WebSocket connection.
         """
         self.connections[session_id] = websocket
+        self.outboxes[session_id] = asyncio.Queue()
 
     def remove_connection(self, session_id: str) -> None:
         """
@@ -86,6 +100,42 @@ class WebSocketConnectionManager:
         """
         if session_id in self.connections:
             del self.connections[session_id]
+        if session_id in self.outboxes:
+            del self.outboxes[session_id]
+
+    def send(self, session_id: str, text: str, droppable: bool = False) -> bool:
+        """
+        Queues a text message for delivery to a session without waiting on the network.
+
+        Args:
+            session_id (str): The unique identifier for the session.
+            text (str): The message to send.
+            droppable (bool): Whether the message may be dropped when the outbox is full.
+
+        Returns:
+            bool: False if the session is gone or a droppable message was dropped.
+        """
+        outbox = self.outboxes.get(session_id)
+        if outbox is None:
+            return False
+        if droppable and outbox.qsize() >= self.outbox_size:
+            logger.warning("Outbox full, dropping progress update for session %s", session_id)
+            return False
+        outbox.put_nowait(text)
+        return True
+
+    async def _send_loop(
+        self, websocket: WebSocket, outbox: asyncio.Queue, session_id: str
+    ) -> None:
+        try:
+            while True:
+                text = await outbox.get()
+                await websocket.send_text(text)
+        except Exception as e:
+            logger.error("Failed to send message to session %s: %s", session_id, e)
+            # Nothing will drain this outbox any more, so make send() report failure
+            if self.outboxes.get(session_id) is outbox:
+                del self.outboxes[session_id]
 
     async def handle_websocket(self, websocket: WebSocket, session_id: str):
         """
@@ -97,31 +147,34 @@ class WebSocketConnectionManager:
         """
         await websocket.accept()
         self.add_connection(session_id, websocket)
+        sender = asyncio.create_task(
+            self._send_loop(websocket, self.outboxes[session_id], session_id)
+        )
         try:
             while True:
                 user_message_text = await websocket.receive_text()
-                chat_id = str(uuid.uuid4())
+                chat_id = f"{_CHAT_ID_PREFIX}-{next(_chat_id_counter)}"
                 user_message = EndUserMessage(content=user_message_text, source="User")
 
-                logger.info(f"Received message with chat_id: {chat_id}")
+                logger.info("Received message with chat_id: %s", chat_id)
 
                 # Publish the user's message to the agent
                 await agent_runtime.publish_message(
                     user_message,
                     DefaultTopicId(type="user_proxy", source=session_id),
                 )
-                await asyncio.sleep(0.1)
         except WebSocketDisconnect:
-            logger.info(f"WebSocket connection closed: {session_id}")
+            logger.info("WebSocket connection closed: %s", session_id)
         except Exception as e:
-            logger.error(f"Exception in WebSocket connection {session_id}: {str(e)}")
+            logger.error("Exception in WebSocket connection %s: %s", session_id, e)
         finally:
             self.remove_connection(session_id)
+            sender.cancel()
             try:
                 if websocket.client_state != WebSocketState.DISCONNECTED:
                     await websocket.close()
             except WebSocketDisconnect:
-                logger.info(f"WebSocket already closed: {session_id}")
+                logger.info("WebSocket already closed: %s", session_id)
 
 
 # User Proxy Agent
@@ -147,14 +200,20 @@ class UserProxyAgent(RoutedAgent):
             message (AgentStructuredResponse): The agent's response message.
             ctx (MessageContext): The message context.
         """
-        logger.info(f"UserProxyAgent received agent response: {message}")
         session_id = ctx.topic_id.source
-        try:
-            websocket = connection_manager.connections.get(session_id)
-            if websocket:
-                await websocket.send_text(f"{message.model_dump_json()}")
-        except Exception as e:
-            logger.error(f"Failed to send message to session {session_id}: {str(e)}")
+        logger.debug("UserProxyAgent received agent response: %s", message)
+        websocket = connection_manager.connections.get(session_id)
+        if websocket is None or websocket.client_state != WebSocketState.CONNECTED:
+            logger.info("Dropping response for closed session %s", session_id)
+            return
+        payload = message.model_dump_json()
+        logger.info(
+            "UserProxyAgent received %s response (%d chars)",
+            message.agent_type.value,
+            len(payload),
+        )
+        if not connection_manager.send(session_id, payload, droppable=message.progress):
+            logger.info("Response for session %s was not delivered", session_id)
 
     @message_handler
     async def handle_user_message(
@@ -167,10 +226,10 @@ class UserProxyAgent(RoutedAgent):
             message (EndUserMessage): The user's message.
             ctx (MessageContext): The message context.
         """
-        logger.info(f"UserProxyAgent received user message: {message.content}")
+        logger.info("UserProxyAgent received user message: %s", message.content)
         # Forward the message to the router
         await self.publish_message(
-            EndUserMessage(content=message.content, source=message.source),
+            message,
             DefaultTopicId(type="router", source=ctx.topic_id.source),
         )
 
@@ -188,7 +247,7 @@ async def websocket_endpoint(websocket: WebSocket):
     Args:
         websocket (WebSocket): The WebSocket connection.
     """
-    session_id = str(uuid.uuid4())
+    session_id = secrets.token_hex(16)
     await connection_manager.handle_websocket(websocket, session_id)
 
 
@@ -1,6 +1,7 @@
 # config.py
 import os
 
+import httpx
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 from azure.cosmos.aio import CosmosClient
 from azure.identity.aio import (
@@ -34,7 +35,7 @@ def GetOrGenerateVisitorPassword():
     if p == "":
         p = os.urandom(16).hex()
         logger.warning("NO FIXED VISITOR PASSWORD SET, GENERATED RANDOM PASSWORD")
-        logger.warning(f"VISITOR PASSWORD: {p}")
+        logger.warning("VISITOR PASSWORD: %s", p)
     return p
 
 
@@ -58,6 +59,15 @@ class Config:
     WEB_PUB_SUB_CONNECTION_STRING = GetRequiredConfig("WEB_PUB_SUB_CONN_STRING")
     WEB_PUB_SUB_HUB_NAME = GetRequiredConfig("WEB_PUB_SUB_HUB_NAME")
 
+    # Seconds of artificial delay added by the simulated booking tools (demo only)
+    TRAVEL_SIM_LATENCY = float(GetOptionalConfig("TRAVEL_SIM_LATENCY", "0"))
+
+    # Maximum travel plan subtasks dispatched to agents at once per worker process
+    LLM_CONCURRENCY = int(GetOptionalConfig("LLM_CONCURRENCY", "8"))
+
+    # Messages of conversation history kept per session and sent to the router
+    SESSION_HISTORY_MAX = int(GetOptionalConfig("SESSION_HISTORY_MAX", "10"))
+
     DEV_BYPASS_AUTH = GetBoolConfig("DEV_BYPASS_AUTH")
     VISITOR_PASSWORD = GetOrGenerateVisitorPassword()
 
@@ -99,13 +109,21 @@ class Config:
         return get_bearer_token_provider(Config.GetAzureCredentials(), scopes)
 
     def GetAzureOpenAIChatCompletionClient(model_capabilities):
-        logger.info(f"Initializing Azure OpenAI client with deployment: {Config.AZURE_OPENAI_DEPLOYMENT_NAME}")
-        logger.info(f"API Version: {Config.AZURE_OPENAI_API_VERSION}")
-        logger.info(f"Model capabilities: {model_capabilities}")
-        
         if Config.__aoai_chatCompletionClient is not None:
             return Config.__aoai_chatCompletionClient
 
+        logger.info("Initializing Azure OpenAI client with deployment: %s", Config.AZURE_OPENAI_DEPLOYMENT_NAME)
+        logger.info("API Version: %s", Config.AZURE_OPENAI_API_VERSION)
+        logger.info("Model capabilities: %s", model_capabilities)
+
+        # One pooled HTTP/2 client for every model call so concurrent sessions share
+        # connections instead of each paying for new TCP/TLS handshakes
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+
         if Config.AZURE_OPENAI_API_KEY == "":
             # Use DefaultAzureCredential for auth
             Config.__aoai_chatCompletionClient = AzureOpenAIChatCompletionClient(
@@ -116,6 +134,7 @@ class Config:
                     "https://cognitiveservices.azure.com/.default"
                 ),
                 model_capabilities=model_capabilities,
+                http_client=http_client,
             )
         else:
             # Fallback behavior to use API key
@@ -125,6 +144,7 @@ class Config:
                 azure_endpoint=Config.AZURE_OPENAI_ENDPOINT,
                 api_key=Config.AZURE_OPENAI_API_KEY,
                 model_capabilities=model_capabilities,
+                http_client=http_client,
             )
 
         return Config.__aoai_chatCompletionClient
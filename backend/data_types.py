@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from dataclasses import dataclass
 from enum import Enum
 from typing import List, Optional, Union, Dict
 from datetime import date
@@ -126,6 +127,14 @@ class CarRental(BaseModel):
     booking_reference: str
 
 
+# Requirements extracted from a car rental request (internal, never serialized)
+@dataclass(frozen=True, slots=True)
+class CarRentalRequirements:
+    rental_city: str = "Unknown"
+    rental_start_date: str = "2023-12-21"
+    rental_end_date: str = "2023-12-26"
+
+
 # Enum to Define Agent Types
 class AgentEnum(str, Enum):
     FlightBooking = "flight_booking"
@@ -158,16 +167,21 @@ class TravelPlan(BaseModel):
 # Generic Response Wrapper
 class AgentStructuredResponse(BaseModel):
     agent_type: AgentEnum
-    data: Union[
-        Activities,
-        DestinationInfo,
-        FlightBooking,
-        HotelBooking,
-        CarRental,
-        Greeter,
-        GroupChatMessage,
-    ]
+    data: Optional[
+        Union[
+            Activities,
+            DestinationInfo,
+            FlightBooking,
+            HotelBooking,
+            CarRental,
+            Greeter,
+            GroupChatMessage,
+        ]
+    ] = None  # None when the agent produced no structured result
     message: Optional[str] = None  # Additional message or notes from the agent
+    # Interim progress update that may be dropped when the client falls behind; used by
+    # the user proxy only and never sent to the client
+    progress: bool = Field(default=False, exclude=True)
 
 
 # Resource Node Model
@@ -69,7 +69,7 @@ class AgentRegistry:
         return tools
 
     async def get_agent(self, intent: str) -> Optional[dict]:
-        logger.info(f"AgentRegistry: Getting agent for intent: {intent}")
+        logger.info("AgentRegistry: Getting agent for intent: %s", intent)
         return self.agents.get(intent)
 
     def get_planner_prompt(self, message: EndUserMessage, history) -> str:
@@ -8,6 +8,8 @@ class SessionStateManager:
     def __init__(self, history_length: int = 100):
         self.session_states = {}
         self.session_histories = {}
+        # Prompt-ready "- <message>" lines, rendered once when each message is added
+        self.session_history_lines = {}
         self.history_length = history_length
 
     def set_active_agent(self, session_id: str, agent_type: str) -> None:
@@ -21,11 +23,18 @@ class SessionStateManager:
             del self.session_states[session_id]
         if session_id in self.session_histories:
             del self.session_histories[session_id]
+        if session_id in self.session_history_lines:
+            del self.session_history_lines[session_id]
 
     def add_to_history(self, session_id: str, message: EndUserMessage) -> None:
         if session_id not in self.session_histories:
             self.session_histories[session_id] = deque(maxlen=self.history_length)
+            self.session_history_lines[session_id] = deque(maxlen=self.history_length)
         self.session_histories[session_id].append(message)
+        self.session_history_lines[session_id].append(f"- {message.content}")
 
     def get_history(self, session_id: str) -> deque:
         return self.session_histories.get(session_id, deque())
+
+    def get_history_lines(self, session_id: str) -> deque:
+        return self.session_history_lines.get(session_id, deque())
@@ -44,7 +44,7 @@ model_capabilities = {
 }
 aoai_model_client = Config.GetAzureOpenAIChatCompletionClient(model_capabilities)
 
-session_state_manager = SessionStateManager()
+session_state_manager = SessionStateManager(history_length=Config.SESSION_HISTORY_MAX)
 
 
 async def initialize_agent_runtime() -> SingleThreadedAgentRuntime:
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from backend.agents.common import StructuredCaller, strict_response_format
+
+
+class Item(BaseModel):
+    name: str
+
+
+class ItemList(BaseModel):
+    items: List[Item]
+
+
+class FakeModelClient:
+    """Answers every call after a fixed delay and records how many overlap."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, messages, extra_create_args=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(content=Item(name=messages[0].content).model_dump_json())
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    client = FakeModelClient(delay=0.05)
+    caller = StructuredCaller(client, Item, source="test", max_concurrency=2)
+
+    results = await asyncio.gather(*(caller.create(f"prompt {i}") for i in range(6)))
+
+    assert [result.name for result in results] == [f"prompt {i}" for i in range(6)]
+    assert client.calls == 6
+    assert client.max_in_flight == 2
+
+
+def test_strict_response_format_covers_nested_models():
+    response_format = strict_response_format(ItemList)
+
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "ItemList"
+    assert response_format["json_schema"]["strict"] is True
+    schema = response_format["json_schema"]["schema"]
+    assert schema["required"] == ["items"]
+    assert schema["additionalProperties"] is False
+    assert schema["$defs"]["Item"]["required"] == ["name"]
+    assert schema["$defs"]["Item"]["additionalProperties"] is False